@@ -19,6 +19,6 @@ setup(
     packages=find_packages("src"),
     package_dir={"": "src"},
     include_package_data=True,
-    install_requires=["numpy", "scikit-learn"],
+    install_requires=["numpy", "numba", "scikit-learn"],
     extras_require={"test": ["pytest"]},
 )
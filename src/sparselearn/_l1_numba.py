@@ -0,0 +1,68 @@
+"""Numba-compiled kernels for the L1 norm and its proximal operator.
+
+The kernels are compiled eagerly for float64 and float32 arrays, so callers
+must pass arrays of one of these types. Input arrays are typed as read-only,
+which also accepts writeable arrays.
+"""
+import math
+
+import numpy as np
+from numba import njit, prange
+
+
+# Fast-math flags without ``nnan`` and ``ninf``, so that NaN and infinity
+# keep their IEEE semantics and propagate through the kernels.
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+@njit(
+    [
+        "void(Array(f8, 1, 'C', readonly=True), f8, f8[::1])",
+        "void(Array(f4, 1, 'C', readonly=True), f8, f4[::1])",
+    ],
+    parallel=True, fastmath=_FASTMATH, cache=True,
+)
+def soft_threshold(x, reg, out):
+    """Write the soft-thresholding of the 1-D array x by the scalar reg to out.
+    """
+    for i in prange(x.size):
+        v = x[i]
+        a = abs(v) - reg
+        out[i] = math.copysign(a, v) if a > 0 or a != a else 0.0
+
+
+@njit(
+    [
+        "void(Array(f8, 1, 'C', readonly=True),"
+        " Array(f8, 1, 'C', readonly=True), f8[::1])",
+        "void(Array(f4, 1, 'C', readonly=True),"
+        " Array(f4, 1, 'C', readonly=True), f4[::1])",
+    ],
+    parallel=True, fastmath=_FASTMATH, cache=True,
+)
+def soft_threshold_weighted(x, reg, out):
+    """Write the soft-thresholding of the 1-D array x by the array reg to out.
+    """
+    for i in prange(x.size):
+        v = x[i]
+        a = abs(v) - reg[i]
+        out[i] = math.copysign(a, v) if a > 0 or a != a else 0.0
+
+
+@njit(
+    [
+        "f8[::1](Array(f8, 2, 'A', readonly=True))",
+        "f8[::1](Array(f4, 2, 'A', readonly=True))",
+    ],
+    fastmath=_FASTMATH, cache=True,
+)
+def row_abs_sums(x):
+    """Compute the L1 norm of each row of the 2-D array x without temporaries.
+    """
+    sums = np.empty(x.shape[0])
+    for i in range(x.shape[0]):
+        s = 0.0
+        for v in x[i]:
+            s += abs(v)
+        sums[i] = s
+    return sums
@@ -0,0 +1,91 @@
+"""Numba-compiled kernels for the simplex projection.
+
+The kernels are compiled eagerly for C-contiguous float64 and float32
+arrays, so callers must pass arrays of one of these types.
+"""
+import numpy as np
+from numba import njit
+
+
+@njit(["f8(f8[::1], f8)", "f8(f4[::1], f8)"], cache=True)
+def simplex_threshold(w, a):
+    """Find the threshold, tau, such that ``np.maximum(w - tau, 0)`` sums to a.
+
+    Uses the algorithm of Condat (2016), which finds tau in one streaming pass
+    over w followed by a few short passes over the remaining candidates. Its
+    worst case is :math:`O(n^2)`, but in practice it is linear and faster than
+    the randomised pivoting of Duchi et al. (2008).
+
+    The candidate sets are stored in w, which is overwritten. During the
+    streaming pass, the discarded candidates are kept in ``w[:t]`` and the
+    active candidates in ``w[t:m]``. Since ``m`` never exceeds the number of
+    elements read so far, the unread part of w is never overwritten.
+
+    An empty w has no threshold, so NaN is returned.
+    """
+    n = w.shape[0]
+    if n == 0:
+        return np.nan
+    t = 0
+    m = 1
+    rho = w[0] - a
+
+    # Streaming pass: keep a running estimate of tau from the active set and
+    # start a new active set when the estimate gets too small.
+    for k in range(1, n):
+        y = w[k]
+        if y > rho:
+            rho += (y - rho)/(m - t + 1)
+            if rho <= y - a:
+                t = m
+                rho = y - a
+            w[m] = y
+            m += 1
+
+    # Move the discarded candidates that may still be in the support back
+    # into the active set, which is then shifted down to follow them.
+    j = 0
+    for k in range(t):
+        y = w[k]
+        if y > rho:
+            w[j] = y
+            j += 1
+            rho += (y - rho)/(m - t + j)
+    for k in range(t, m):
+        w[j] = w[k]
+        j += 1
+    t = 0
+    m = j
+
+    # Remove active candidates below the threshold until none are removed.
+    # The last candidate is kept and gives tau = y - a directly, since with
+    # a <= 0, NaN or rounding (y - a == y) it need not exceed rho.
+    size = m
+    while True:
+        old_size = size
+        j = t
+        for k in range(t, m):
+            y = w[k]
+            if y > rho:
+                w[j] = y
+                j += 1
+            elif size == 1:
+                return y - a
+            else:
+                size -= 1
+                rho += (rho - y)/size
+        m = j
+        if size == old_size:
+            return rho
+
+
+@njit(["f8[::1](f8[:, ::1], f8)", "f8[::1](f4[:, ::1], f8)"], cache=True)
+def row_simplex_thresholds(w, a):
+    """Find the simplex threshold of each row of the 2-D array w.
+
+    The rows of w are overwritten, see ``simplex_threshold``.
+    """
+    tau = np.empty(w.shape[0])
+    for i in range(w.shape[0]):
+        tau[i] = simplex_threshold(w[i], a)
+    return tau
@@ -1,10 +1,45 @@
 from abc import ABC, abstractmethod
-import numexpr as ne
 import numpy as np
 
+from ._l1_numba import row_abs_sums
+from ._simplex_numba import row_simplex_thresholds
+
+
+def _float_dtype(x):
+    """Return the floating point type, float32 or float64, used to process x.
+    """
+    return np.promote_types(x.dtype, np.float32)
+
+
+def _reuse_buffer(buf, shape, dtype):
+    """Return buf if it has the given shape and dtype, otherwise a new buffer.
+    """
+    if buf is None or buf.shape != shape or buf.dtype != dtype:
+        return np.empty(shape, dtype=dtype)
+    return buf
+
+
+def _rows(x):
+    """View x as a 2-D array with one vector per row.
+    """
+    return x.reshape(int(np.prod(x.shape[:-1])), x.shape[-1])
+
+
+def _squared_norms(x):
+    """Compute the squared L2 norm along the last axis of x.
+    """
+    x = x.astype(_float_dtype(x), copy=False)
+    if x.ndim == 1:
+        return x @ x
+    return np.einsum('...i,...i->...', x, x)
+
 
 class BaseProjection(ABC):
     """Base class for orthogonal projections.
+
+    Projections act along the last axis, so an array with more than one
+    dimension is projected as a batch of vectors. ``is_feasible`` likewise
+    returns one boolean per vector.
     """
 
     def __call__(self, x):
@@ -24,10 +59,11 @@ class NonNegativityProjection(BaseProjection):
     """
 
     def project(self, x):
-        return ne.evaluate("x*(x >= 0)")
+        return np.maximum(x, 0)
 
     def is_feasible(self, x):
-        return np.all(x >= 0)
+        # With initial=0 the check also works for empty vectors
+        return x.min(axis=-1, initial=0) >= 0
 
 
 class SimplexProjection(BaseProjection):
@@ -36,28 +72,29 @@ class SimplexProjection(BaseProjection):
 
     def __init__(self, simplex_size):
         self.simplex_size = simplex_size
-        self.non_negativity_projection = NonNegativityProjection()
+        self._buf = None
 
     def project(self, x):
-        y = self.non_negativity_projection.project(x)
-        v = y
-        rho = np.mean(v) - self.simplex_size/len(v)
-
-        while True:
-            v_old = v
-            rho = np.mean(v) - self.simplex_size/len(v)
-            v = v[v > rho]
+        dtype = _float_dtype(x)
+        self._buf = buf = _reuse_buffer(self._buf, x.shape, dtype)
+        np.copyto(buf, x)
+        tau = row_simplex_thresholds(_rows(buf), self.simplex_size)
+        tau = tau.reshape(x.shape[:-1] + (1,))
 
-            if len(v) == len(v_old):
-                return np.maximum(y - rho, 0)
+        y = np.subtract(x, tau, dtype=dtype)
+        return np.maximum(y, 0, out=y)
 
     def is_feasible(self, x):
-        return abs(x.sum() - self.simplex_size) < 1e-10 and np.all(x >= 0)
+        return (
+            (abs(x.sum(axis=-1) - self.simplex_size) < 1e-10)
+            & (x.min(axis=-1, initial=0) >= 0)
+        )
 
 
 class BallProjection(BaseProjection):
     def __init__(self, max_norm):
-        self.max_norm = max_norm
+        self.max_norm = float(max_norm)
+        self._feasibility_bound = self.max_norm + 1e-10
 
 
 class L1Projection(BallProjection):
@@ -66,38 +103,63 @@ class L1Projection(BallProjection):
 
     def __init__(self, max_norm):
         super().__init__(max_norm)
-        self.simplex_projection = SimplexProjection(max_norm)
+        self._buf = None
 
     def project(self, x):
-        if self.is_feasible(x):
+        feasible = self.is_feasible(x)
+        if np.all(feasible):
             return x
-        return np.sign(x) * self.simplex_projection(np.abs(x))
+
+        y = np.abs(x, dtype=_float_dtype(x))
+        self._buf = buf = _reuse_buffer(self._buf, y.shape, y.dtype)
+        np.copyto(buf, y)
+        tau = row_simplex_thresholds(_rows(buf), self.max_norm)
+        tau = np.where(feasible, 0, tau.reshape(feasible.shape))
+
+        y -= tau[..., np.newaxis]
+        np.maximum(y, 0, out=y)
+        return np.copysign(y, x, out=y)
 
     def is_feasible(self, x):
-        return np.linalg.norm(x, 1) < self.max_norm + 1e-10
+        rows = _rows(x).astype(_float_dtype(x), copy=False)
+        norms = row_abs_sums(rows).reshape(x.shape[:-1])
+        return norms < self._feasibility_bound
 
 
 class L2Projection(BallProjection):
     """Project downto the L2 ball, i.e. :math:`||x||_2 < a`.
     """
 
-    def project(self, x):
-        xnorm = np.linalg.norm(x)
-        if xnorm < self.max_norm:
-            return x
+    def project(self, x, out=None):
+        """Project x, optionally writing the result into the buffer ``out``.
+        """
+        scale = self.max_norm / (np.sqrt(_squared_norms(x)) + 1e-16)
+        if np.all(scale >= 1):
+            if out is None:
+                return x
+            np.copyto(out, x)
+            return out
 
-        return (self.max_norm / (xnorm + 1e-16)) * x
+        scale = np.minimum(scale, 1)
+        return np.multiply(x, scale[..., np.newaxis], out=out)
 
     def is_feasible(self, x):
-        return np.linalg.norm(x) < self.max_norm + 1e-10
+        return np.sqrt(_squared_norms(x)) < self._feasibility_bound
 
 
 class LInfProjection(BallProjection):
     """Project downto the L-infinity ball, i.e. :math:`||x||_\infty < a`.
     """
 
-    def project(self, x):
-        return np.sign(x) * np.minimum(np.abs(x), self.max_norm)
+    def project(self, x, out=None):
+        """Project x, optionally writing the result into the buffer ``out``.
+        """
+        return np.clip(x, -self.max_norm, self.max_norm, out=out)
 
     def is_feasible(self, x):
-        return np.linalg.norm(x, np.inf) < self.max_norm + 1e-10
+        dtype = _float_dtype(x)
+        # With initial=0 the bound is also defined for empty vectors
+        upper = x.max(axis=-1, initial=0).astype(dtype)
+        lower = x.min(axis=-1, initial=0).astype(dtype)
+        bound = np.maximum(upper, -lower)
+        return bound < self._feasibility_bound
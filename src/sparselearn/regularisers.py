@@ -4,6 +4,8 @@ from typing import NamedTuple
 
 import numpy as np
 
+from ._l1_numba import soft_threshold, soft_threshold_weighted
+
 
 class BaseSparseRegulariser(ABC):
     """Base class for sparsity-based regularisers.
@@ -39,7 +41,8 @@ class BaseSparseRegulariser(ABC):
         """
         The proximal loss :math:`R(x) + 0.5||x - y||^2`.
         """
-        return self.__call__(x) + 0.5*np.linalg.norm(x - y)
+        residual = (x - y).ravel()
+        return self.__call__(x) + 0.5*(residual @ residual)
 
 
 # Lasso
@@ -69,7 +72,7 @@ class L1Regularisation(BaseSparseRegulariser):
         ---------
         x : np.ndarray
         """
-        return np.linalg.norm((weights*x).ravel(), 1)
+        return np.linalg.norm((self.reg*x).ravel(), 1)
 
     def subgradient(self, x):
         """
@@ -79,7 +82,7 @@ class L1Regularisation(BaseSparseRegulariser):
         ---------
         x : np.ndarray
         """
-        return np.sign(x)
+        return self.reg*np.sign(x)
 
     def prox(self, x):
         """
@@ -89,7 +92,20 @@ class L1Regularisation(BaseSparseRegulariser):
         ---------
         x : np.ndarray
         """
-        return self.sign(x)*np.maximum(np.abs(x) - self.reg, 0)
+        shape = np.shape(x)
+        dtype = np.promote_types(np.asarray(x).dtype, np.float32)
+        x = np.ascontiguousarray(x, dtype=dtype)
+        out = np.empty_like(x)
+        if np.ndim(self.reg) == 0:
+            soft_threshold(x.reshape(-1), float(self.reg), out.reshape(-1))
+        else:
+            reg = np.ascontiguousarray(
+                np.broadcast_to(self.reg, x.shape), dtype=x.dtype
+            )
+            soft_threshold_weighted(
+                x.reshape(-1), reg.reshape(-1), out.reshape(-1)
+            )
+        return out.reshape(shape)
 
 
 # GroupLasso
@@ -124,8 +140,94 @@ class GroupLassoRegularisation(BaseSparseRegulariser):
         reg : float or Iterable
         groups : Iterable or None
         """
-        self.groups = np.asarray(groups)
-        self.reg = reg
+        self._reg = reg
+        self.groups = groups
+
+    @property
+    def reg(self):
+        """
+        The regularisation coefficient(s).
+
+        Setting it recomputes the cached per-group coefficients.
+        """
+        return self._reg
+
+    @reg.setter
+    def reg(self, reg):
+        self._reg = reg
+        self._init_group_layout()
+
+    @property
+    def groups(self):
+        """
+        The group of each coefficient row, or None for one group per row.
+
+        Setting it recomputes the cached group layout.
+        """
+        return self._groups
+
+    @groups.setter
+    def groups(self, groups):
+        self._groups = None if groups is None else np.asarray(groups)
+        self._init_group_layout()
+
+    def _init_group_layout(self):
+        """
+        Precompute a group-sorted layout of the coefficients.
+
+        Ordering the coefficients by ``self._order`` places the members of
+        each group contiguously, with group ``g`` in the slice
+        ``self._boundaries[g]:self._boundaries[g + 1]``.
+        """
+        if self.groups is None:
+            return
+
+        self._order = np.argsort(self.groups, kind="stable")
+        sorted_groups = self.groups[self._order]
+        starts = np.flatnonzero(sorted_groups[1:] != sorted_groups[:-1]) + 1
+        self._boundaries = np.concatenate(([0], starts, [len(sorted_groups)]))
+        self._group_sizes = np.diff(self._boundaries)
+        self._group_index = np.empty(len(sorted_groups), dtype=int)
+        self._group_index[self._order] = np.repeat(
+            np.arange(len(self._group_sizes)), self._group_sizes
+        )
+
+        if isinstance(self.reg, numbers.Number):
+            self._reg_per_group = self.reg*np.sqrt(self._group_sizes)
+        else:
+            unique_groups = sorted_groups[self._boundaries[:-1]]
+            self._reg_per_group = np.array(
+                [self.reg[group] for group in unique_groups]
+            )
+
+    def _group_norms(self, x):
+        """
+        Compute the norm of each group and its regularisation coefficient.
+
+        Arguments
+        ---------
+        x : np.ndarray
+            Coefficient array
+        """
+        sq = (x**2).reshape(len(x), -1).sum(axis=1)
+        if self.groups is None:
+            if isinstance(self.reg, numbers.Number):
+                reg = np.broadcast_to(self.reg, sq.shape)
+            else:
+                reg = np.array([self.reg[i] for i in range(len(x))])
+            return np.sqrt(sq), reg
+
+        gsum = np.add.reduceat(sq[self._order], self._boundaries[:-1])
+        gnorm = np.sqrt(gsum)
+        return gnorm, self._reg_per_group
+
+    def _expand(self, per_group, x):
+        """
+        Broadcast one value per group back to the shape of x.
+        """
+        if self.groups is not None:
+            per_group = per_group[self._group_index]
+        return per_group.reshape((-1,) + (1,)*(x.ndim - 1))
 
     def iter_groups(self, x):
         """
@@ -144,15 +246,13 @@ class GroupLassoRegularisation(BaseSparseRegulariser):
                     reg = self.reg[i]
 
                 yield GroupMetaInfo(x_g, reg, i)
+            return
 
-        for group in np.unique(self.groups):
-            idxes = self.groups == group
-            x_g = x[idxes]
-            if isinstance(self.reg, numbers.Number):
-                reg = sqrt(idxes.sum())*self.reg
-            else:
-                reg = self.reg[group]
-            yield GroupMetaInfo(x_g, reg, idxes)
+        x_sorted = x[self._order]
+        bounds = zip(self._boundaries[:-1], self._boundaries[1:])
+        for reg, (start, end) in zip(self._reg_per_group, bounds):
+            idxes = self._order[start:end]
+            yield GroupMetaInfo(x_sorted[start:end], reg, idxes)
 
     def __call__(self, x):
         """
@@ -162,9 +262,8 @@ class GroupLassoRegularisation(BaseSparseRegulariser):
         ---------
         x : np.ndarray
         """
-        loss = 0
-        for x_g, reg, _ in self.iter_groups():
-            loss += reg*np.linalg.norm(x_g)
+        gnorm, reg = self._group_norms(x)
+        return np.sum(reg*gnorm)
 
     def subgradient(self, x):
         """
@@ -174,14 +273,11 @@ class GroupLassoRegularisation(BaseSparseRegulariser):
         ---------
         x : np.ndarray
         """
-        subgradient = np.empty_like(x)
-        for x_g, reg, idxes in self.iter_groups():
-            xnorm = np.linalg.norm(x_g)
-            if xnorm < 1e-16:
-                subgradient[idxes] = 0
-                continue
-
-            subgradient[idxes] = (reg/xnorm)*x_g
+        gnorm, reg = self._group_norms(x)
+        scale = np.divide(
+            reg, gnorm, out=np.zeros_like(gnorm), where=gnorm >= 1e-16
+        )
+        return self._expand(scale, x)*x
 
     def prox(self, x):
         """
@@ -191,11 +287,6 @@ class GroupLassoRegularisation(BaseSparseRegulariser):
         ---------
         x : np.ndarray
         """
-        y = np.empty_like(subgradient)
-        for x_g, reg, idxes in self.iter_groups():
-            xnorm = np.linalg.norm(x_g)
-            if xnorm < reg:
-                y[idxes] = 0
-                continue
-            
-            y[idxes] = x_g - (reg/xnorm)*x_g
+        gnorm, reg = self._group_norms(x)
+        scale = np.maximum(1 - reg/np.maximum(gnorm, 1e-16), 0)
+        return self._expand(scale, x)*x
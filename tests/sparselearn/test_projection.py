@@ -5,8 +5,6 @@ TODO: Implement KKT conditions test.
 """
 
 from abc import ABC, abstractmethod
-import itertools
-
 import numpy as np
 import pytest
 
@@ -14,7 +12,7 @@ from sparselearn import projections
 
 
 def perturb_normally(x, rate):
-    xnorm = np.linalg.norm(x)
+    xnorm = np.sqrt(np.sum(x*x, axis=-1, keepdims=True))
     rate /= xnorm + 1e-16
 
     return x + rate*np.random.standard_normal(x.shape)
@@ -26,7 +24,7 @@ class BaseTestProjection(ABC):
 
     @pytest.fixture
     def points(self):
-        return [np.random.standard_normal((100,))*i for i in range(20)]
+        return np.random.standard_normal((20, 100))*np.arange(20)[:, np.newaxis]
 
     def projections(self):
         """Iterate through all projections that should be tested.
@@ -41,42 +39,61 @@ class BaseTestProjection(ABC):
     def test_projects_to_interior(self, points):
         """Test that the projection in fact projects downto the feasible set.
         """
-        for x, projection in itertools.product(points, self.projections()):
-            y = projection(x)
-            assert projection.is_feasible(y)
+        for projection in self.projections():
+            y = projection(points)
+            assert np.all(projection.is_feasible(y))
+
+    def test_projects_batch_rowwise(self, points):
+        """Test that projecting a batch equals projecting each point.
+        """
+        for projection in self.projections():
+            y = np.stack([projection(x) for x in points])
+            assert np.allclose(projection(points), y)
+
+    def test_empty_vectors(self):
+        """Test that empty vectors and batches of them can be projected.
+        """
+        for projection in self.projections():
+            for x in [np.zeros((0,)), np.zeros((3, 0))]:
+                assert projection(x).shape == x.shape
+                assert np.shape(projection.is_feasible(x)) == x.shape[:-1]
 
     def check_projects_to_minimum(self, x, projection):
         num_perturbations = 100
         y = projection(x)
+        distance = np.linalg.norm(x - y, axis=-1)
         for _ in range(num_perturbations):
             y_pert = perturb_normally(y, 0.1)
-            if projection.is_feasible(y_pert):
-                assert np.linalg.norm(x - y) < np.linalg.norm(x - y_pert)
+            feasible = projection.is_feasible(y_pert)
+            distance_pert = np.linalg.norm(x - y_pert, axis=-1)
+            assert np.all((distance < distance_pert)[feasible])
 
     def test_projects_to_minimum(self, points):
         """Test that the minimum is attained in the given point.
         """
-        num_perturbations = 100
-
-        for x, projection in itertools.product(points, self.projections()):
-            self.check_projects_to_minimum(x, projection)
+        for projection in self.projections():
+            self.check_projects_to_minimum(points, projection)
 
     def test_is_feasible_checks_feasibility(self, points):
         """Test that the is_feasible function of the projection works.
         """
-        for x, kwargs in itertools.product(points, self.projection_kwargs):
+        for kwargs in self.projection_kwargs:
             projection = self.Projection(**kwargs)
-            y = projection(x)
-            
-            assert self.is_feasible(x, **kwargs) == projection.is_feasible(x)
-            assert self.is_feasible(y, **kwargs) == projection.is_feasible(y)
+            y = projection(points)
+
+            assert np.array_equal(
+                self.is_feasible(points, **kwargs), projection.is_feasible(points)
+            )
+            assert np.array_equal(
+                self.is_feasible(y, **kwargs), projection.is_feasible(y)
+            )
 
 
 class TestNonNegativeProjection(BaseTestProjection):
     Projection = projections.NonNegativityProjection
 
     def is_feasible(self, x):
-        return np.all(x >= 0)
+        return np.all(x >= 0, axis=-1)
 
 
 class TestSimplexProjection(BaseTestProjection):
@@ -84,7 +101,31 @@ class TestSimplexProjection(BaseTestProjection):
     projection_kwargs = [{'simplex_size': 0.5}, {'simplex_size': 1}, {'simplex_size': 5}]
 
     def is_feasible(self, x, simplex_size):
-        return abs(np.sum(x)-simplex_size) < 1e-8 and np.all(x >= 0)
+        return (abs(np.sum(x, axis=-1)-simplex_size) < 1e-8) & np.all(x >= 0, axis=-1)
+
+    def test_projects_points_with_small_positive_part(self):
+        """Test points whose positive entries sum to less than the simplex size.
+        """
+        projection = self.Projection(simplex_size=1)
+        assert np.allclose(projection(np.array([-1., 0.])), [0, 1])
+        assert np.allclose(projection(np.array([-3., -1., -1.])), [0, 0.5, 0.5])
+
+    def test_projects_degenerate_inputs(self):
+        """Test a zero simplex size, a huge single entry and NaN entries.
+        """
+        assert np.allclose(self.Projection(0.)(np.array([1., 2., 3.])), 0)
+        assert np.all(np.isfinite(self.Projection(1.)(np.array([1e20]))))
+        y = self.Projection(1.)(np.array([np.nan, 2., 3.]))
+        assert np.any(np.isnan(y))
+
+    def test_projects_entries_crowded_around_threshold(self):
+        """Test inputs with many (near) ties, sorted in both directions.
+        """
+        x = 1 + 1e-12*np.random.standard_normal(1000)
+        for points in [x, np.sort(x), np.sort(x)[::-1], np.ones(1000)]:
+            for kwargs in self.projection_kwargs:
+                y = self.Projection(**kwargs)(points)
+                assert np.allclose(y, kwargs['simplex_size']/1000)
 
 
 class BaseTestBallProjection(BaseTestProjection):
@@ -97,20 +138,66 @@ class BaseTestLPBallProjection(BaseTestBallProjection):
     p = None
 
     def is_feasible(self, x, max_norm):
-        return (np.linalg.norm(x, self.p) - max_norm) < 1e-10
+        return (np.linalg.norm(x, self.p, axis=-1) - max_norm) < 1e-10
     
 
+class OutBufferTests:
+    """Tests for projections whose ``project`` accepts an ``out`` buffer.
+    """
+
+    def test_project_writes_to_out(self, points):
+        """Test that passing an output buffer gives the same projection.
+        """
+        for projection in self.projections():
+            out = np.empty_like(points)
+            y = projection.project(points, out=out)
+
+            assert y is out
+            assert np.allclose(out, projection(points))
+
+
 class TestL1BallProjection(BaseTestLPBallProjection):
     Projection = projections.L1Projection
     p = 1
 
+    def test_projects_to_zero_ball(self):
+        """Test that the ball of radius zero projects everything to zero.
+        """
+        x = np.random.standard_normal((5, 100))
+        assert np.allclose(self.Projection(max_norm=0)(x), 0)
+
+    def test_matches_signed_simplex_projection(self, points):
+        """Test that infeasible points project to sign(x) times the simplex projection of |x|.
+        """
+        for kwargs in self.projection_kwargs:
+            projection = self.Projection(**kwargs)
+            infeasible = ~projection.is_feasible(points)
+
+            simplex_projection = projections.SimplexProjection(kwargs['max_norm'])
+            y = np.sign(points)*simplex_projection(np.abs(points))
+            assert np.allclose(projection(points)[infeasible], y[infeasible])
 
-class TestL2BallProjection(BaseTestLPBallProjection):
+
+class TestL2BallProjection(OutBufferTests, BaseTestLPBallProjection):
     Projection = projections.L2Projection
     p = 2
 
+    def test_integer_input_does_not_overflow(self):
+        """Test that integer norms are computed in floating point.
+        """
+        x = np.array([200, 200], dtype=np.uint8)
+        assert np.allclose(self.Projection(10)(x), [np.sqrt(50)]*2)
+        assert not self.Projection(10).is_feasible(np.array([16], np.uint8))
+        assert not self.Projection(1).is_feasible(np.array([2**40, 1]))
 
-class TestLInfBallProjection(BaseTestLPBallProjection):
+
+class TestLInfBallProjection(OutBufferTests, BaseTestLPBallProjection):
     Projection = projections.LInfProjection
     p = np.inf
 
+    def test_integer_feasibility_does_not_wrap(self):
+        """Test that negating integer minima does not wrap around.
+        """
+        assert self.Projection(10).is_feasible(np.array([5], np.uint8))
+        assert not self.Projection(10).is_feasible(np.array([-128], np.int8))
+
@@ -57,3 +57,169 @@ class BaseTestRegulariser:
                 y = self.random_x()
                 
                 assert regulariser(y) > intercept + slope.T@(y - x)
+
+
+L1_PROX_CASES = [
+    (0.5, np.random.standard_normal((20,))),
+    (np.linspace(0.1, 2, 3), np.random.standard_normal((20, 3))),
+    (0.5, np.random.standard_normal((20,)).astype(np.float32)),
+    (0.5, np.random.standard_normal((3, 20)).T),
+    (1.5, np.arange(-5, 5)),
+]
+
+
+class TestL1Regularisation(BaseTestRegulariser):
+    Regulariser = regularisers.L1Regularisation
+    regulariser_kwargs = {'reg': 0.5}
+
+    def random_x(self):
+        # Keep every entry above the coefficient so no entry is zeroed
+        x = np.random.standard_normal((50,))
+        return x + np.sign(x)
+
+    def regulariser_loss(self, x, regulariser_kwargs):
+        return np.sum(np.abs(regulariser_kwargs['reg']*x))
+
+    @pytest.mark.parametrize("reg, x", L1_PROX_CASES)
+    def test_prox_matches_soft_threshold(self, reg, x):
+        """Test the proximal operator against NumPy soft-thresholding.
+        """
+        y = self.Regulariser(reg).prox(x)
+
+        assert y.dtype == np.promote_types(x.dtype, np.float32)
+        assert np.allclose(y, np.sign(x)*np.maximum(np.abs(x) - reg, 0))
+
+    def test_prox_keeps_scalar_shape(self):
+        """Test that 0-d and scalar input give a 0-d result.
+        """
+        for x in [np.float64(2.), np.array(-2.), 2.]:
+            y = self.Regulariser(0.5).prox(x)
+            assert np.shape(y) == ()
+            assert np.isclose(y, np.sign(x)*1.5)
+
+    def test_prox_propagates_nan(self):
+        """Test that NaN entries stay NaN in the proximal operator.
+        """
+        y = self.Regulariser(0.5).prox(np.array([np.nan, 1.]))
+        assert np.isnan(y[0]) and y[1] == 0.5
+
+
+def reference_groups(x, reg, groups):
+    """Iterate through the groups of x with a boolean mask per group.
+    """
+    if groups is None:
+        for i, x_g in enumerate(x):
+            yield x_g, reg if np.isscalar(reg) else reg[i], i
+        return
+
+    for group in np.unique(groups):
+        idxes = groups == group
+        if np.isscalar(reg):
+            reg_g = np.sqrt(idxes.sum())*reg
+        else:
+            reg_g = reg[group]
+        yield x[idxes], reg_g, idxes
+
+
+def reference_group_lasso_prox(x, reg, groups):
+    y = np.empty_like(x)
+    for x_g, reg_g, idxes in reference_groups(x, reg, groups):
+        xnorm = np.linalg.norm(x_g)
+        y[idxes] = 0 if xnorm < reg_g else (1 - reg_g/xnorm)*x_g
+    return y
+
+
+GROUPS = np.array([3, 0, 2, 0, 1, 3, 3, 2, 1, 0])
+GROUP_LASSO_CASES = [
+    (0.5, GROUPS, (10,)),
+    (0.5, GROUPS, (10, 3)),
+    ({0: 0.2, 1: 1.0, 2: 0.5, 3: 2.0}, GROUPS, (10,)),
+    (np.array([0.2, 1.0, 0.5, 2.0]), GROUPS, (10, 3)),
+    (0.5, None, (10,)),
+    (0.5, None, (10, 3)),
+    (np.linspace(0.1, 2, 10), None, (10, 3)),
+    ({i: 0.1*(i + 1) for i in range(10)}, None, (10,)),
+]
+
+
+class TestGroupLassoRegularisation(BaseTestRegulariser):
+    Regulariser = regularisers.GroupLassoRegularisation
+    regulariser_kwargs = {'reg': 0.1, 'groups': GROUPS}
+
+    def random_x(self):
+        # Keep every group norm above its coefficient so no group is zeroed
+        x = np.random.standard_normal((10,))
+        return x + np.sign(x)
+
+    def regulariser_loss(self, x, regulariser_kwargs):
+        groups = reference_groups(x, **regulariser_kwargs)
+        return sum(reg*np.linalg.norm(x_g) for x_g, reg, _ in groups)
+
+    @pytest.mark.parametrize("reg, groups, shape", GROUP_LASSO_CASES)
+    def test_call_matches_group_loop(self, reg, groups, shape):
+        """Test the penalty against a loop over masked groups.
+        """
+        x = np.random.standard_normal(shape)
+        regulariser = self.Regulariser(reg, groups)
+        loss = self.regulariser_loss(x, {'reg': reg, 'groups': groups})
+        assert np.isclose(regulariser(x), loss)
+
+    @pytest.mark.parametrize("reg, groups, shape", GROUP_LASSO_CASES)
+    def test_prox_matches_group_loop(self, reg, groups, shape):
+        """Test the proximal operator against a loop over masked groups.
+        """
+        x = np.random.standard_normal(shape)
+        regulariser = self.Regulariser(reg, groups)
+        y = reference_group_lasso_prox(x, reg, groups)
+        assert np.allclose(regulariser.prox(x), y)
+
+    def test_zero_groups(self):
+        """Test that zero and small groups give zero subgradient and prox.
+        """
+        regulariser = self.Regulariser(0.1, GROUPS)
+        x = np.random.standard_normal((10,)) + 5
+        x[GROUPS == 0] = 0
+        x[GROUPS == 2] = 1e-3
+
+        subgradient = regulariser.subgradient(x)
+        y = regulariser.prox(x)
+        assert np.all(subgradient[GROUPS == 0] == 0)
+        assert np.all(subgradient[GROUPS == 2] != 0)
+        assert np.all(y[GROUPS == 0] == 0)
+        assert np.all(y[GROUPS == 2] == 0)
+        assert np.all(y[(GROUPS == 1) | (GROUPS == 3)] != 0)
+
+    def test_setting_reg_and_groups_updates_penalty(self):
+        """Test that changing reg or groups after construction is respected.
+        """
+        x = np.random.standard_normal((10,))
+        regulariser = self.Regulariser(0.5, GROUPS)
+
+        regulariser.reg = 0.1
+        assert np.isclose(
+            regulariser(x), self.regulariser_loss(x, {'reg': 0.1, 'groups': GROUPS})
+        )
+        assert np.allclose(
+            regulariser.prox(x), reference_group_lasso_prox(x, 0.1, GROUPS)
+        )
+
+        regulariser.groups = None
+        assert np.isclose(
+            regulariser(x), self.regulariser_loss(x, {'reg': 0.1, 'groups': None})
+        )
+
+    def test_iter_groups_with_string_labels(self):
+        """Test that iter_groups gives the masked groups for non-numeric labels.
+        """
+        groups = np.array(['b', 'a', 'c', 'a', 'b', 'b'])
+        reg = {'a': 0.5, 'b': 1.0, 'c': 2.0}
+        x = np.random.standard_normal((6, 2))
+        regulariser = self.Regulariser(reg, groups)
+
+        group_info = list(regulariser.iter_groups(x))
+        expected = list(reference_groups(x, reg, groups))
+        assert len(group_info) == len(expected)
+        for (x_g, reg_g, idxes), (x_ref, reg_ref, _) in zip(group_info, expected):
+            assert np.array_equal(x_g, x_ref)
+            assert np.array_equal(x[idxes], x_ref)
+            assert reg_g == reg_ref